@@ -6,63 +6,137 @@ This tool provides a user-friendly interface to manage and automate Microsoft Ed
 import os
 import sys
 import argparse
-import time
-from edge_profile_manager import EdgeProfileManager
+import functools
+import shlex
+import signal
+import threading
+
+
+class CliArgumentParser(argparse.ArgumentParser):
+    """
+    ArgumentParser that reuses a single formatter for validation lookups.
+
+    add_argument() asks for a formatter to validate metavars and help strings
+    (twice per argument on Python 3.14+). Those lookups don't mutate the
+    formatter, so one cached instance is shared. Rendering usage/help and
+    add_subparsers() fill a formatter with sections, so they still get a
+    fresh one each time. Subparsers inherit this class via add_parser().
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Set before super().__init__(), which already adds the -h argument
+        self._cached_formatter = None
+        self._rendering = False
+        super().__init__(*args, **kwargs)
+
+    def _get_formatter(self):
+        if self._rendering:
+            return super()._get_formatter()
+        if self._cached_formatter is None:
+            self._cached_formatter = super()._get_formatter()
+        return self._cached_formatter
+
+    def _render(self, method, *args, **kwargs):
+        """Call method with fresh formatters."""
+        rendering, self._rendering = self._rendering, True
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._rendering = rendering
 
-def main():
-    """Main entry point for the CLI application."""
-    parser = argparse.ArgumentParser(
-        description="Microsoft Edge Profile Automation Tool",
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
+    def convert_arg_line_to_args(self, arg_line):
+        # Allow several whitespace-separated arguments per line in @files,
+        # with shell-style quoting for names containing spaces and # comments
+        try:
+            return shlex.split(arg_line, comments=True)
+        except ValueError as e:
+            # e.g. an unquoted apostrophe; name the offending file line
+            self.error(f"{arg_line!r}: {e}")
 
-    # Create subparsers for different commands
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    def format_usage(self):
+        return self._render(super().format_usage)
+
+    def format_help(self):
+        return self._render(super().format_help)
 
-    # Add profile command
+    def add_subparsers(self, **kwargs):
+        return self._render(super().add_subparsers, **kwargs)
+
+
+def _build_add(subparsers, argv):
+    """Add profile command."""
     add_parser = subparsers.add_parser("add", help="Add a new Edge profile")
     add_parser.add_argument("name", help="Profile name")
     add_parser.add_argument("--path", "-p", help="Profile directory path (e.g., 'Profile 1'). If not provided, will use auto-generated path.")
     add_parser.add_argument("--language", "-l", help="Preferred language (e.g., en-US, es, fr)")
 
-    # Remove profile command
+
+def _build_remove(subparsers, argv):
+    """Remove profile command."""
     remove_parser = subparsers.add_parser("remove", help="Remove an Edge profile")
     remove_parser.add_argument("name", help="Profile name to remove")
 
-    # List profiles command
-    list_parser = subparsers.add_parser("list", help="List all profiles")
 
-    # Open profile command
+def _build_list(subparsers, argv):
+    """List profiles command."""
+    subparsers.add_parser("list", help="List all profiles")
+
+
+def _build_open(subparsers, argv):
+    """Open profile command."""
     open_parser = subparsers.add_parser("open", help="Open Edge with a specific profile")
     open_parser.add_argument("name", help="Profile name to open")
 
-    # Open multiple profiles command
+
+def _build_open_multiple(subparsers, argv):
+    """Open multiple profiles command."""
     open_multiple_parser = subparsers.add_parser("open-multiple", help="Open multiple Edge profiles")
     open_multiple_parser.add_argument("names", nargs="+", help="Profile names to open")
     open_multiple_parser.add_argument("--delay", "-d", type=int, default=2,
                                      help="Delay in seconds between opening profiles")
     open_multiple_parser.add_argument("--no-skip", action="store_true",
                                      help="If set, will raise an error when a profile doesn't exist instead of skipping it")
+    open_multiple_parser.add_argument("--concurrent", dest="concurrent", action="store_true", default=True,
+                                     help="Launch up to 5 browsers at the same time, ignoring --delay (default)")
+    open_multiple_parser.add_argument("--no-concurrent", dest="concurrent", action="store_false",
+                                     help="Open the profiles one after another, waiting --delay seconds between them")
+
 
-    # Switch profile command
+def _build_switch(subparsers, argv):
+    """Switch profile command."""
     switch_parser = subparsers.add_parser("switch", help="Switch from one profile to another")
     switch_parser.add_argument("from_profile", help="Current profile name")
     switch_parser.add_argument("to_profile", help="Profile name to switch to")
 
-    # Set language command
+
+def _build_set_language(subparsers, argv):
+    """Set language command."""
     language_parser = subparsers.add_parser("set-language", help="Set preferred language for a profile")
     language_parser.add_argument("name", help="Profile name")
     language_parser.add_argument("language", help="Language code (e.g., en-US, es, fr)")
 
-    # Show history command
+
+def _build_history(subparsers, argv):
+    """Show history command."""
     history_parser = subparsers.add_parser("history", help="Show profile access history")
     history_parser.add_argument("--name", "-n", help="Profile name (if not specified, shows all)")
 
-    # Close all profiles command
-    close_parser = subparsers.add_parser("close-all", help="Close all open Edge profiles")
 
-    # Add batch processing command
-    batch_parser = subparsers.add_parser("open-batch", 
+def _build_close_all(subparsers, argv):
+    """Close all profiles command."""
+    subparsers.add_parser("close-all", help="Close all open Edge profiles (terminates every Edge process)")
+
+
+def _build_discover(subparsers, argv):
+    """Discover profiles command."""
+    discover_parser = subparsers.add_parser("discover", help="List the profile directories in the Edge User Data directory")
+    discover_parser.add_argument("--register", action="store_true",
+                                 help="Add every directory that is not registered yet as a profile named after it")
+
+
+def _build_open_batch(subparsers, argv):
+    """Batch processing command."""
+    batch_parser = subparsers.add_parser("open-batch",
         help="Open multiple profiles in batches to manage system resources")
     batch_parser.add_argument("names", nargs="+", help="Profile names to open")
     batch_parser.add_argument("--batch-size", type=int, default=5,
@@ -73,249 +147,520 @@ def main():
                             help="Delay in seconds between batches")
     batch_parser.add_argument("--no-skip", action="store_true",
                             help="If set, will raise an error when a profile doesn't exist")
+    batch_parser.add_argument("--concurrent", dest="concurrent", action="store_true", default=True,
+                            help="Open the profiles of each batch at the same time, ignoring --profile-delay (default)")
+    batch_parser.add_argument("--no-concurrent", dest="concurrent", action="store_false",
+                            help="Open the profiles of each batch one after another")
 
-    # Add batch configuration commands
-    batch_config_parser = subparsers.add_parser("batch", help="Batch configuration commands")
-    batch_subparsers = batch_config_parser.add_subparsers(dest="batch_command")
 
-    # List batches
-    batch_subparsers.add_parser("list", help="List all configured batches")
+def _build_batch_list(subparsers, argv):
+    """List batches."""
+    subparsers.add_parser("list", help="List all configured batches")
+
 
-    # Add batch
-    add_batch_parser = batch_subparsers.add_parser("add", help="Add or update a batch configuration")
+def _build_batch_add(subparsers, argv):
+    """Add batch."""
+    add_batch_parser = subparsers.add_parser("add", help="Add or update a batch configuration")
     add_batch_parser.add_argument("name", help="Batch name")
     add_batch_parser.add_argument("profiles", nargs="+", help="Profile names to include in batch")
     add_batch_parser.add_argument("--batch-size", type=int, default=5)
-    add_batch_parser.add_argument("--profile-delay", type=int, default=2)
+    add_batch_parser.add_argument("--profile-delay", type=int, default=2,
+                                  help="Delay in seconds between profiles when the batch is run with --no-concurrent")
     add_batch_parser.add_argument("--batch-delay", type=int, default=30)
 
-    # Remove batch
-    remove_batch_parser = batch_subparsers.add_parser("remove", help="Remove a batch configuration")
+
+def _build_batch_remove(subparsers, argv):
+    """Remove batch."""
+    remove_batch_parser = subparsers.add_parser("remove", help="Remove a batch configuration")
     remove_batch_parser.add_argument("name", help="Batch name to remove")
 
-    # Run batch
-    run_batch_parser = batch_subparsers.add_parser("run", help="Run a configured batch")
+
+def _build_batch_run(subparsers, argv):
+    """Run batch."""
+    run_batch_parser = subparsers.add_parser("run", help="Run a configured batch")
     run_batch_parser.add_argument("name", help="Batch name to run")
+    run_batch_parser.add_argument("--concurrent", dest="concurrent", action="store_true", default=True,
+                                  help="Open the profiles of each batch at the same time, ignoring the profile delay (default)")
+    run_batch_parser.add_argument("--no-concurrent", dest="concurrent", action="store_false",
+                                  help="Open the profiles of each batch one after another, waiting the profile delay between them")
 
-    # Parse arguments
-    args = parser.parse_args()
 
-    # Initialize the profile manager
-    manager = EdgeProfileManager()
+BATCH_COMMANDS = {
+    "list": _build_batch_list,
+    "add": _build_batch_add,
+    "remove": _build_batch_remove,
+    "run": _build_batch_run,
+}
 
-    # Execute the appropriate command
-    if args.command == "add":
-        success = manager.add_profile(args.name, args.path, args.language)
-        if success:
-            profile_info = manager.list_profiles()[args.name]
-            path = profile_info.get("path", "Unknown")
-            print(f"Profile '{args.name}' added successfully with path '{path}'")
+
+def _build_batch(subparsers, argv):
+    """Batch configuration commands."""
+    batch_config_parser = subparsers.add_parser("batch", help="Batch configuration commands")
+    batch_subparsers = batch_config_parser.add_subparsers(dest="batch_command", required=True)
+    _add_commands(batch_subparsers, BATCH_COMMANDS, argv)
+
+
+# Subcommand parser builders, in the order they are listed by --help. Each
+# builder gets the subparsers action and the arguments after the command name.
+COMMANDS = {
+    "add": _build_add,
+    "remove": _build_remove,
+    "list": _build_list,
+    "open": _build_open,
+    "open-multiple": _build_open_multiple,
+    "switch": _build_switch,
+    "set-language": _build_set_language,
+    "history": _build_history,
+    "close-all": _build_close_all,
+    "discover": _build_discover,
+    "open-batch": _build_open_batch,
+    "batch": _build_batch,
+}
+
+
+FROMFILE_EPILOG = """\
+Arguments can also be read from a file by prefixing its name with '@':
+
+  edge_automation_cli.py open-batch @profiles.txt --batch-size 5
+
+The file may list several arguments per line and '#' starts a comment.
+Lines use shell-style quoting: wrap names that contain spaces, apostrophes,
+backslashes or '#' in double quotes, e.g. "Bob's Profile". An unquoted
+backslash is dropped, and an unmatched quote is an error.
+"""
+
+
+def build_parser(argv=None):
+    """
+    Build the argument parser for the given command line.
+
+    Only the subparser of the command being invoked is constructed, down to
+    the nested batch subcommands, so `<command> --help` costs one command's
+    setup. When no known command is present (e.g. a bare --help), every
+    subparser is built so help and error messages list all commands.
+
+    Args:
+        argv (list, optional): Command-line arguments, defaults to sys.argv[1:]
+
+    Returns:
+        argparse.ArgumentParser: The configured parser
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = CliArgumentParser(
+        description="Microsoft Edge Profile Automation Tool",
+        epilog=FROMFILE_EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        fromfile_prefix_chars="@"
+    )
+
+    # Create subparsers for different commands
+    subparsers = parser.add_subparsers(dest="command", required=True, help="Command to execute")
+
+    _add_commands(subparsers, COMMANDS, argv)
+
+    return parser
+
+
+def _add_commands(subparsers, builders, argv):
+    """
+    Add the subparser named by the first positional in argv, or all of them.
+
+    Args:
+        subparsers: Action returned by add_subparsers()
+        builders (dict): Maps each command name to its parser builder
+        argv (list): Arguments that follow the parent command
+    """
+    for index, arg in enumerate(argv):
+        if not arg.startswith("-"):
+            if arg in builders:
+                builders[arg](subparsers, argv[index + 1:])
+                return
+            break
+
+    for build in builders.values():
+        build(subparsers, [])
+
+
+def _wait_for_interrupt(cleanup):
+    """
+    Block until Ctrl+C is pressed, then run cleanup.
+
+    The main thread parks on an Event that the SIGINT handler sets, so the
+    process sleeps without periodic wakeups instead of polling.
+
+    Args:
+        cleanup (callable): Called once the wait has been interrupted
+    """
+    stop = threading.Event()
+    previous_handler = signal.signal(signal.SIGINT, lambda *_: stop.set())
+    try:
+        if sys.platform == "win32":
+            # Lock waits can't be interrupted by Ctrl+C on Windows, so wake up
+            # periodically to let the signal handler run
+            while not stop.wait(1):
+                pass
         else:
-            print(f"Failed to add profile '{args.name}' (it may already exist)")
+            stop.wait()
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    cleanup()
+
+
+def _close_driver(driver):
+    """Close a single browser opened by the CLI."""
+    print("\nClosing browser...")
+    driver.quit()
+    print("Browser closed")
+
+
+def _close_all(manager):
+    """Close every browser opened by the CLI."""
+    print("\nClosing all browsers...")
+    manager.close_all_profiles()
+    print("All browsers closed")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_manager():
+    """
+    Create the profile manager on first use.
+
+    Handlers call this instead of main(), so --help and usage errors never
+    load the profile files or import Selenium.
+    """
+    from edge_profile_manager import EdgeProfileManager
+    return EdgeProfileManager()
+
+
+def _write_lines(lines):
+    """
+    Write lines to stdout with a single call instead of one print() per line.
+
+    The text is encoded once and written straight to the binary buffer,
+    bypassing the text layer; streams without a buffer get a plain write().
+    """
+    text = "\n".join(lines) + "\n"
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(text)
+        return
+
+    # Flush pending text first so earlier print() output stays in order
+    sys.stdout.flush()
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    buffer.write(text.encode(sys.stdout.encoding or "utf-8", sys.stdout.errors or "strict"))
+
+
+def _report_batch_progress(manager, events, total, skipped=0):
+    """
+    Show batch results as they arrive, then keep the browsers open until Ctrl+C.
+
+    Args:
+        manager (EdgeProfileManager): Manager that opened the profiles
+        events (iterable): (status, profile_name, error) tuples from the manager
+        total (int): Number of profiles in the batch run
+        skipped (int): Profiles already skipped before the run started
+    """
+    counts = {"ok": 0, "fail": 0, "skip": skipped}
+    failures = []
+    for processed, (status, profile_name, error) in enumerate(events, 1):
+        counts[status] += 1
+        if status == "fail":
+            failures.append((profile_name, error))
+        sys.stdout.write(f"\rProcessed {processed}/{total} profiles")
+        sys.stdout.flush()
+
+    print("\n\nBatch processing completed:")
+    print(f"Successfully opened: {counts['ok']} profiles")
+    print(f"Failed to open: {counts['fail']} profiles")
+    print(f"Skipped: {counts['skip']} profiles")
+
+    if failures:
+        print("\nFailed profiles:")
+        for profile_name, error in failures:
+            print(f"- {profile_name}: {error}")
+
+    if counts["ok"]:
+        print("\nPress Ctrl+C to close all browsers and exit")
+        _wait_for_interrupt(lambda: _close_all(manager))
+
+
+def _cmd_add(args):
+    manager = _get_manager()
+    profile_info = manager.add_profile(args.name, args.path, args.language)
+    if profile_info:
+        # Save now so a failed write is reported instead of the success message
+        manager.flush()
+        path = profile_info.get("path", "Unknown")
+        print(f"Profile '{args.name}' added successfully with path '{path}'")
+    else:
+        print(f"Failed to add profile '{args.name}' (it may already exist)")
+
+
+def _cmd_remove(args):
+    manager = _get_manager()
+    success = manager.remove_profile(args.name)
+    if success:
+        manager.flush()
+        print(f"Profile '{args.name}' removed successfully")
+    else:
+        print(f"Failed to remove profile '{args.name}' (it may not exist)")
+
+
+def _cmd_list(args):
+    manager = _get_manager()
+    profiles = manager.list_profiles()
+    if profiles:
+        lines = ["Available profiles:"]
+        lines.extend(
+            f"- {name}: Path={data.get('path')}, Language={data.get('preferred_language', 'Not set')}"
+            for name, data in profiles.items()
+        )
+        _write_lines(lines)
+    else:
+        print("No profiles found. Add profiles using the 'add' command.")
+
+
+def _cmd_open(args):
+    manager = _get_manager()
+    try:
+        driver = manager.open_profile(args.name)
+        print(f"Opened Edge with profile '{args.name}'")
+        print("Press Ctrl+C to close the browser and exit")
+        _wait_for_interrupt(lambda: _close_driver(driver))
+    except Exception as e:
+        print(f"Error opening profile '{args.name}': {e}")
+
 
-    elif args.command == "remove":
-        success = manager.remove_profile(args.name)
-        if success:
-            print(f"Profile '{args.name}' removed successfully")
+def _cmd_open_multiple(args):
+    manager = _get_manager()
+    try:
+        if args.concurrent:
+            print(f"Opening {len(args.names)} profiles concurrently...")
         else:
-            print(f"Failed to remove profile '{args.name}' (it may not exist)")
+            print(f"Opening {len(args.names)} profiles with {args.delay}s delay between them...")
+        # Use skip_missing=False if --no-skip is provided
+        skip_missing = not args.no_skip
+        drivers = manager.open_multiple_profiles(args.names, args.delay, skip_missing=skip_missing,
+                                                 concurrent=args.concurrent)
+        opened_count = len(drivers)
+        print(f"Successfully opened {opened_count} out of {len(args.names)} profiles")
+
+        if opened_count > 0:
+            print("Press Ctrl+C to close all browsers and exit")
+            _wait_for_interrupt(lambda: _close_all(manager))
+    except Exception as e:
+        print(f"Error opening multiple profiles: {e}")
 
-    elif args.command == "list":
-        profiles = manager.list_profiles()
-        if profiles:
-            print("Available profiles:")
-            for name, data in profiles.items():
-                language = data.get("preferred_language", "Not set")
-                print(f"- {name}: Path={data.get('path')}, Language={language}")
+
+def _cmd_switch(args):
+    manager = _get_manager()
+    try:
+        driver = manager.switch_to_profile(args.from_profile, args.to_profile)
+        print(f"Switched from '{args.from_profile}' to '{args.to_profile}'")
+        print("Press Ctrl+C to close the browser and exit")
+        _wait_for_interrupt(lambda: _close_driver(driver))
+    except Exception as e:
+        print(f"Error switching profiles: {e}")
+
+
+def _cmd_set_language(args):
+    manager = _get_manager()
+    success = manager.set_language_preference(args.name, args.language)
+    if success:
+        manager.flush()
+        print(f"Set preferred language for '{args.name}' to '{args.language}'")
+    else:
+        print(f"Failed to set language for profile '{args.name}' (it may not exist)")
+
+
+def _cmd_history(args):
+    manager = _get_manager()
+    if args.name:
+        history = manager.get_profile_history(args.name)
+        if history:
+            _write_lines([
+                f"History for profile '{args.name}':",
+                f"- Last opened: {history.get('last_opened', 'Never')}",
+                f"- Open count: {history.get('open_count', 0)}",
+            ])
         else:
-            print("No profiles found. Add profiles using the 'add' command.")
+            print(f"No history found for profile '{args.name}'")
+    else:
+        history = manager.get_profile_history()
+        if history:
+            lines = ["Profile access history:"]
+            for name, data in history.items():
+                lines.append(f"- {name}:")
+                lines.append(f"  - Last opened: {data.get('last_opened', 'Never')}")
+                lines.append(f"  - Open count: {data.get('open_count', 0)}")
+            _write_lines(lines)
+        else:
+            print("No profile access history found")
 
-    elif args.command == "open":
-        try:
-            driver = manager.open_profile(args.name)
-            print(f"Opened Edge with profile '{args.name}'")
-            print("Press Ctrl+C to close the browser and exit")
-            try:
-                # Keep the script running until interrupted
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\nClosing browser...")
-                driver.quit()
-                print("Browser closed")
-        except Exception as e:
-            print(f"Error opening profile '{args.name}': {e}")
-
-    elif args.command == "open-multiple":
-        try:
-            print(f"Opening {len(args.names)} profiles with {args.delay}s delay between them...")
-            # Use skip_missing=False if --no-skip is provided
-            skip_missing = not args.no_skip
-            drivers = manager.open_multiple_profiles(args.names, args.delay, skip_missing=skip_missing)
-            opened_count = len(drivers)
-            print(f"Successfully opened {opened_count} out of {len(args.names)} profiles")
-
-            if opened_count > 0:
-                print("Press Ctrl+C to close all browsers and exit")
-                try:
-                    # Keep the script running until interrupted
-                    while True:
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    print("\nClosing all browsers...")
-                    manager.close_all_profiles()
-                    print("All browsers closed")
-        except Exception as e:
-            print(f"Error opening multiple profiles: {e}")
-
-    elif args.command == "switch":
-        try:
-            driver = manager.switch_to_profile(args.from_profile, args.to_profile)
-            print(f"Switched from '{args.from_profile}' to '{args.to_profile}'")
-            print("Press Ctrl+C to close the browser and exit")
-            try:
-                # Keep the script running until interrupted
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\nClosing browser...")
-                driver.quit()
-                print("Browser closed")
-        except Exception as e:
-            print(f"Error switching profiles: {e}")
-
-    elif args.command == "set-language":
-        success = manager.set_language_preference(args.name, args.language)
-        if success:
-            print(f"Set preferred language for '{args.name}' to '{args.language}'")
+
+def _cmd_close_all(args):
+    manager = _get_manager()
+    # Browsers opened by earlier CLI runs belong to other processes, so the
+    # manager has no sessions to quit; terminate the Edge processes instead
+    manager.close_all_profiles(fast=True)
+    print("Closed all Edge browser instances")
+
+
+def _cmd_discover(args):
+    manager = _get_manager()
+    if args.register:
+        added = manager.auto_register_profiles()
+        if added:
+            manager.flush()
+            _write_lines([f"Registered {len(added)} profiles:"] + [f"- {name}" for name in added])
         else:
-            print(f"Failed to set language for profile '{args.name}' (it may not exist)")
-
-    elif args.command == "history":
-        if args.name:
-            history = manager.get_profile_history(args.name)
-            if history:
-                print(f"History for profile '{args.name}':")
-                print(f"- Last opened: {history.get('last_opened', 'Never')}")
-                print(f"- Open count: {history.get('open_count', 0)}")
-            else:
-                print(f"No history found for profile '{args.name}'")
+            print("No unregistered Edge profile directories found")
+        return
+
+    directories = manager.discover_profiles()
+    if directories:
+        registered_paths = {data.get("path") for data in manager.list_profiles().values()}
+        lines = [f"Edge profile directories in {manager.user_data_dir}:"]
+        lines.extend(
+            f"- {directory}" + ("" if directory in registered_paths else " (not registered)")
+            for directory in directories
+        )
+        _write_lines(lines)
+    else:
+        print(f"No Edge profile directories found in {manager.user_data_dir}")
+
+
+def _cmd_open_batch(args):
+    manager = _get_manager()
+    try:
+        print(f"Opening {len(args.names)} profiles in batches...")
+        print(f"Batch size: {args.batch_size}")
+        if args.concurrent:
+            print("Profiles in a batch are opened concurrently")
         else:
-            history = manager.get_profile_history()
-            if history:
-                print("Profile access history:")
-                for name, data in history.items():
-                    print(f"- {name}:")
-                    print(f"  - Last opened: {data.get('last_opened', 'Never')}")
-                    print(f"  - Open count: {data.get('open_count', 0)}")
-            else:
-                print("No profile access history found")
-
-    elif args.command == "close-all":
-        count = manager.close_all_profiles()
-        print(f"Closed {count} Edge browser instances")
-
-    elif args.command == "open-batch":
-        try:
-            print(f"Opening {len(args.names)} profiles in batches...")
-            print(f"Batch size: {args.batch_size}")
             print(f"Delay between profiles: {args.profile_delay}s")
-            print(f"Delay between batches: {args.batch_delay}s")
-            
-            results = manager.open_profiles_in_batches(
-                args.names,
-                batch_size=args.batch_size,
-                delay_between_profiles=args.profile_delay,
-                delay_between_batches=args.batch_delay,
-                skip_missing=not args.no_skip
-            )
-
-            print("\nBatch processing completed:")
-            print(f"Successfully opened: {len(results['successful'])} profiles")
-            print(f"Failed to open: {len(results['failed'])} profiles")
-            print(f"Skipped: {len(results['skipped'])} profiles")
-
-            if results['failed']:
-                print("\nFailed profiles:")
-                for failure in results['failed']:
-                    print(f"- {failure['profile']}: {failure['error']}")
-
-            if results['successful']:
-                print("\nPress Ctrl+C to close all browsers and exit")
-                try:
-                    while True:
-                        time.sleep(1)
-                except KeyboardInterrupt:
-                    print("\nClosing all browsers...")
-                    manager.close_all_profiles()
-                    print("All browsers closed")
-
-        except Exception as e:
-            print(f"Error during batch processing: {e}")
-
-    elif args.command == "batch":
-        if args.batch_command == "list":
-            batches = manager.get_batch_names()
-            if batches:
-                print("Configured batches:")
-                for batch_name in batches:
-                    config = manager.batch_config[batch_name]
-                    print(f"\n{batch_name}:")
-                    print(f"  Profiles: {', '.join(config['profiles'])}")
-                    print(f"  Batch size: {config['batch_size']}")
-                    print(f"  Profile delay: {config['profile_delay']}s")
-                    print(f"  Batch delay: {config['batch_delay']}s")
-            else:
-                print("No batches configured")
-
-        elif args.batch_command == "add":
-            manager.add_batch(
-                args.name,
-                args.profiles,
-                args.batch_size,
-                args.profile_delay,
-                args.batch_delay
-            )
-            print(f"Batch '{args.name}' configured successfully")
-
-        elif args.batch_command == "remove":
-            if manager.remove_batch(args.name):
-                print(f"Batch '{args.name}' removed successfully")
-            else:
-                print(f"Batch '{args.name}' not found")
-
-        elif args.batch_command == "run":
-            try:
-                print(f"Running batch '{args.name}'...")
-                results = manager.run_batch(args.name)
-                
-                print("\nBatch processing completed:")
-                print(f"Successfully opened: {len(results['successful'])} profiles")
-                print(f"Failed to open: {len(results['failed'])} profiles")
-                print(f"Skipped: {len(results['skipped'])} profiles")
-
-                if results['failed']:
-                    print("\nFailed profiles:")
-                    for failure in results['failed']:
-                        print(f"- {failure['profile']}: {failure['error']}")
-
-                if results['successful']:
-                    print("\nPress Ctrl+C to close all browsers and exit")
-                    try:
-                        while True:
-                            time.sleep(1)
-                    except KeyboardInterrupt:
-                        print("\nClosing all browsers...")
-                        manager.close_all_profiles()
-                        print("All browsers closed")
-
-            except Exception as e:
-                print(f"Error running batch: {e}")
+        print(f"Delay between batches: {args.batch_delay}s")
 
+        # Check every name against the registry once, before anything is opened
+        profiles = manager.list_profiles()
+        names = [name for name in args.names if name in profiles]
+        missing = [name for name in args.names if name not in profiles]
+        if missing:
+            if args.no_skip:
+                print(f"Error during batch processing: Unknown profiles: {', '.join(missing)}")
+                return
+            print(f"Skipping {len(missing)} unknown profiles: {', '.join(missing)}")
+
+        events = manager.open_profiles_in_batches_iter(
+            names,
+            batch_size=args.batch_size,
+            delay_between_profiles=args.profile_delay,
+            delay_between_batches=args.batch_delay,
+            skip_missing=not args.no_skip,
+            concurrent=args.concurrent
+        )
+        _report_batch_progress(manager, events, len(names), skipped=len(missing))
+
+    except Exception as e:
+        print(f"Error during batch processing: {e}")
+
+
+def _cmd_batch_list(args):
+    manager = _get_manager()
+    batches = manager.get_batch_names()
+    if batches:
+        batch_config = manager.batch_config
+        print("Configured batches:")
+        for batch_name in batches:
+            config = batch_config[batch_name]
+            print(f"\n{batch_name}:")
+            print(f"  Profiles: {', '.join(config['profiles'])}")
+            print(f"  Batch size: {config['batch_size']}")
+            print(f"  Profile delay: {config['profile_delay']}s (with --no-concurrent)")
+            print(f"  Batch delay: {config['batch_delay']}s")
     else:
-        parser.print_help()
+        print("No batches configured")
 
-if __name__ == "__main__":
+
+def _cmd_batch_add(args):
+    manager = _get_manager()
+    manager.add_batch(
+        args.name,
+        args.profiles,
+        args.batch_size,
+        args.profile_delay,
+        args.batch_delay
+    )
+    manager.flush()
+    print(f"Batch '{args.name}' configured successfully")
+
+
+def _cmd_batch_remove(args):
+    manager = _get_manager()
+    if manager.remove_batch(args.name):
+        manager.flush()
+        print(f"Batch '{args.name}' removed successfully")
+    else:
+        print(f"Batch '{args.name}' not found")
+
+
+def _cmd_batch_run(args):
+    manager = _get_manager()
+    try:
+        print(f"Running batch '{args.name}'...")
+        events = manager.run_batch_iter(args.name, concurrent=args.concurrent)
+        total = len(manager.batch_config[args.name]["profiles"])
+        _report_batch_progress(manager, events, total)
+
+    except Exception as e:
+        print(f"Error running batch: {e}")
+
+
+BATCH_HANDLERS = {
+    "list": _cmd_batch_list,
+    "add": _cmd_batch_add,
+    "remove": _cmd_batch_remove,
+    "run": _cmd_batch_run,
+}
+
+
+def _cmd_batch(args):
+    BATCH_HANDLERS[args.batch_command](args)
+
+
+HANDLERS = {
+    "add": _cmd_add,
+    "remove": _cmd_remove,
+    "list": _cmd_list,
+    "open": _cmd_open,
+    "open-multiple": _cmd_open_multiple,
+    "switch": _cmd_switch,
+    "set-language": _cmd_set_language,
+    "history": _cmd_history,
+    "close-all": _cmd_close_all,
+    "discover": _cmd_discover,
+    "open-batch": _cmd_open_batch,
+    "batch": _cmd_batch,
+}
+
+
+def main():
+    """Main entry point for the CLI application."""
+    parser = build_parser()
+
+    # Parse arguments (argparse exits with usage if no command is given)
+    args = parser.parse_args()
+
+    # Execute the appropriate command
+    HANDLERS[args.command](args)
+
+
+def run():
+    """Run main() with the CLI's error reporting; used by the script and the zipapp."""
     try:
         main()
     except KeyboardInterrupt:
@@ -324,3 +669,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
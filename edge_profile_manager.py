@@ -5,13 +5,22 @@ which profiles have been opened.
 """
 
 import os
+import sys
 import json
+import atexit
 import time
 import logging
+import shutil
+import subprocess
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options
-from selenium.common.exceptions import WebDriverException
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up, fall back to the standard library
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -24,10 +33,209 @@ logging.basicConfig(
 )
 logger = logging.getLogger("EdgeProfileManager")
 
+# Compact the history log into the history file once it grows past this size
+HISTORY_LOG_COMPACT_BYTES = 1024 * 1024
+
+# Seconds the background flusher waits after a change so that bursts are written together
+FLUSH_INTERVAL = 0.5
+
+# Seconds a scan of the Edge User Data directory is reused without checking it again
+DISCOVERY_TTL = 5
+
+# Records the Edge/WebDriver build that last passed the startup check
+WEBDRIVER_CHECK_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "edge_profile_manager", "webdriver_ok")
+
+
+def _find_executable(names, candidates=()):
+    """Return the first existing path among candidates and names found on PATH, or None."""
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    for name in names:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _webdriver_check_key():
+    """
+    Identify the installed Edge and Edge WebDriver builds by path and mtime.
+
+    Returns:
+        str: Key for the WebDriver check cache, or None if Edge can't be located
+    """
+    candidates = []
+    if os.name == "nt":
+        for env in ("PROGRAMFILES(X86)", "PROGRAMFILES", "LOCALAPPDATA"):
+            base = os.environ.get(env)
+            if base:
+                candidates.append(os.path.join(base, "Microsoft", "Edge", "Application", "msedge.exe"))
+    elif sys.platform == "darwin":
+        candidates.append("/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge")
+    edge = _find_executable(["msedge", "microsoft-edge", "microsoft-edge-stable"], candidates)
+    if edge is None:
+        return None
+
+    parts = []
+    for path in (edge, _find_executable(["msedgedriver"])):
+        if path:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+    return "\n".join(parts)
+
+
+# (webdriver, Options, WebDriverException), imported on first use by _lazy_selenium()
+_SELENIUM = None
+
+
+def _lazy_selenium():
+    """
+    Import selenium the first time a browser is needed.
+
+    Reading and editing profiles, history and batches never touches selenium,
+    so its import cost is only paid by code that opens or closes browsers.
+
+    Returns:
+        tuple: (webdriver module, Edge Options class, WebDriverException class)
+    """
+    global _SELENIUM
+    if _SELENIUM is None:
+        from selenium import webdriver
+        from selenium.webdriver.edge.options import Options
+        from selenium.common.exceptions import WebDriverException
+        _SELENIUM = (webdriver, Options, WebDriverException)
+    return _SELENIUM
+
+
+def _profile_number(path):
+    """Return N for an Edge profile directory named "Profile N", otherwise 0."""
+    if path and path.startswith("Profile "):
+        try:
+            return int(path.split(" ")[1])
+        except (ValueError, IndexError):
+            pass
+    return 0
+
+
+def _json_loads(data):
+    """Parse JSON from bytes; invalid input raises json.JSONDecodeError."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, indent=True):
+    """Serialize obj to JSON bytes, pretty-printed unless indent is False."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=4 if indent else None).encode("utf-8")
+
+
+# Contents of JSON files keyed by absolute path, as ((mtime_ns, size), bytes).
+# Only the bytes are shared; each load parses its own copy, so managers that
+# use the same file never see each other's unsaved changes.
+_JSON_CACHE = {}
+
+
+def _load_json_cached(path):
+    """
+    Load a JSON file, reusing its contents instead of reading it again while it is unchanged.
+
+    Returns:
+        The parsed data, a new object on every call
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file does not contain valid JSON
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _JSON_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return _json_loads(cached[1])
+
+    with open(key, 'rb') as f:
+        raw = f.read()
+    data = _json_loads(raw)
+    _JSON_CACHE[key] = (signature, raw)
+    return data
+
+
+def _create_temp_file(path):
+    """
+    Create a new, uniquely named file next to path for writing.
+
+    Unlike tempfile.mkstemp(), which always creates 0600 files, the usual
+    0666 mode is requested so the process umask applies as for open().
+
+    Returns:
+        tuple: (file descriptor, temporary file path)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = f"{path}.{os.urandom(6).hex()}.tmp"
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _store_json(path, data, durable=False):
+    """
+    Write data to a JSON file and keep the cache entry for it current.
+
+    The data goes to a uniquely named temporary file next to path that is then
+    renamed over it, so an interrupted write never leaves a truncated file
+    behind and concurrent saves of the same file cannot clobber each other.
+
+    Args:
+        path (str): Path of the JSON file
+        data: JSON-serializable data to write
+        durable (bool): If True, fsync the file and its directory before returning
+    """
+    key = os.path.abspath(path)
+    raw = _json_dumps(data)
+    fd, tmp = _create_temp_file(key)
+    try:
+        try:
+            # Keep the permissions of the file being replaced
+            os.chmod(tmp, os.stat(key).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+            # Renaming keeps mtime and size, and another save may replace
+            # path right after ours, so take the signature from this file
+            stat = os.fstat(f.fileno())
+        os.replace(tmp, key)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if durable and os.name != "nt":
+        # Make the rename itself survive a crash
+        dir_fd = os.open(os.path.dirname(key), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    _JSON_CACHE[key] = ((stat.st_mtime_ns, stat.st_size), raw)
+
+
 class EdgeProfileManager:
     """Manages Microsoft Edge browser profiles for automation."""
 
-    def __init__(self, profiles_file="edge_profiles.json", history_file="profile_history.json", batch_config_file="batch_config.json"):
+    # Set once the WebDriver check has passed in this process
+    _webdriver_checked = False
+
+    def __init__(self, profiles_file="edge_profiles.json", history_file="profile_history.json", batch_config_file="batch_config.json", durable=False):
         """
         Initialize the Edge Profile Manager.
 
@@ -35,20 +243,89 @@ class EdgeProfileManager:
             profiles_file (str): Path to the JSON file storing profile information
             history_file (str): Path to the JSON file storing profile access history
             batch_config_file (str): Path to the JSON file storing batch configurations
+            durable (bool): If True, fsync JSON saves and history log flushes
         """
         self.profiles_file = profiles_file
         self.history_file = history_file
+        # Profile opens are appended here and folded into history_file on compaction
+        self.history_log_file = os.path.splitext(history_file)[0] + ".log"
         self.batch_config_file = batch_config_file
+        self.durable = durable
+        # Edge User Data directory and the launch arguments every profile shares
+        self.user_data_dir = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge\User Data")
+        self._base_options_args = [
+            f"--user-data-dir={self.user_data_dir}",
+            # Prevent crashes
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--remote-debugging-port=0",
+        ]
+        # Last scan of user_data_dir as (monotonic time, dir mtime_ns, names)
+        self._discovered = None
+        self._history_log = None
+        self._history_log_size = 0
+        self._history_log_torn = False
         self.profiles = self._load_profiles()
-        self.history = self._load_history()
+        # History is kept as open counts and last-opened times per profile and
+        # only turned back into the file format by the history property
+        self._open_count = Counter()
+        self._last_opened = {}
+        for profile_name, entry in self._load_history().items():
+            self._open_count[profile_name] = entry.get("open_count", 0)
+            self._last_opened[profile_name] = entry.get("last_opened")
+        self._replay_history_log()
         self.batch_config = self._load_batch_config()
+        # Highest "Profile N" number in use, for auto-generated profile paths
+        self._max_profile_num = max(
+            (_profile_number(p.get("path")) for p in self.profiles.values()), default=0
+        )
+        # Profiles never opened, in registration order (dict used as an ordered set)
+        self._unopened = dict.fromkeys(name for name in self.profiles if name not in self._last_opened)
         self.active_drivers = {}
+        # Guards profiles, history, batch_config, active_drivers and the dirty
+        # marks against concurrent opens and the background flusher
+        self._lock = threading.Lock()
+        # Data sets changed since the last flush(): "profiles", "batch_config".
+        # History changes go to the history log instead.
+        self._dirty = set()
+        self._flush_requested = threading.Event()
+        self._stop_flusher = threading.Event()
 
         # Ensure Edge WebDriver is available
         self._check_webdriver()
 
+        # Changes are written by a background thread shortly after they happen
+        # until close() is called
+        self._flusher = threading.Thread(target=self._flusher_loop, name="EdgeProfileManager-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self._close_at_exit)
+
     def _check_webdriver(self):
-        """Check if Edge WebDriver is available and compatible."""
+        """
+        Check if Edge WebDriver is available and compatible.
+
+        The check launches a headless browser, so it runs at most once per
+        process and is skipped while the Edge and WebDriver binaries that
+        last passed it (see WEBDRIVER_CHECK_CACHE) are unchanged.
+        """
+        if EdgeProfileManager._webdriver_checked:
+            return
+
+        try:
+            cache_key = _webdriver_check_key()
+        except OSError:
+            cache_key = None
+        if cache_key is not None:
+            try:
+                with open(WEBDRIVER_CHECK_CACHE, 'r') as f:
+                    if f.read() == cache_key:
+                        EdgeProfileManager._webdriver_checked = True
+                        logger.debug("Edge WebDriver check skipped, binaries unchanged since last check")
+                        return
+            except OSError:
+                pass
+
+        webdriver, Options, WebDriverException = _lazy_selenium()
         try:
             # This is a simplified check - in a real implementation,
             # you might want to check the Edge version and download the appropriate driver
@@ -57,55 +334,135 @@ class EdgeProfileManager:
             driver = webdriver.Edge(options=edge_options)
             driver.quit()
             logger.info("Edge WebDriver is available and working")
+            EdgeProfileManager._webdriver_checked = True
         except WebDriverException as e:
             logger.error(f"Edge WebDriver issue: {e}")
             logger.info("Please download the appropriate Edge WebDriver from: "
                        "https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/")
             raise
 
+        if cache_key is not None:
+            try:
+                os.makedirs(os.path.dirname(WEBDRIVER_CHECK_CACHE), exist_ok=True)
+                with open(WEBDRIVER_CHECK_CACHE, 'w') as f:
+                    f.write(cache_key)
+            except OSError as e:
+                logger.debug(f"Could not write {WEBDRIVER_CHECK_CACHE}: {e}")
+
     def _load_profiles(self):
         """Load profile information from the profiles file."""
-        if os.path.exists(self.profiles_file):
-            try:
-                with open(self.profiles_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error parsing {self.profiles_file}. Using empty profiles.")
-                return {}
-        else:
+        try:
+            profiles = _load_json_cached(self.profiles_file)
+        except FileNotFoundError:
             logger.info(f"Profiles file {self.profiles_file} not found. Creating new profiles data.")
             return {}
+        except json.JSONDecodeError:
+            logger.error(f"Error parsing {self.profiles_file}. Using empty profiles.")
+            return {}
+
+        # Older entries store the directory under "profile_path"; keep a single key
+        for profile_data in profiles.values():
+            if "profile_path" in profile_data:
+                profile_data["path"] = profile_data.pop("profile_path")
+        return profiles
 
     def _save_profiles(self):
         """Save profile information to the profiles file."""
-        with open(self.profiles_file, 'w') as f:
-            json.dump(self.profiles, f, indent=4)
+        _store_json(self.profiles_file, self.profiles, self.durable)
         logger.info(f"Profiles saved to {self.profiles_file}")
 
     def _load_history(self):
         """Load profile access history from the history file."""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error parsing {self.history_file}. Using empty history.")
-                return {}
-        else:
+        try:
+            return _load_json_cached(self.history_file)
+        except FileNotFoundError:
             logger.info(f"History file {self.history_file} not found. Creating new history data.")
             return {}
+        except json.JSONDecodeError:
+            logger.error(f"Error parsing {self.history_file}. Using empty history.")
+            return {}
 
     def _save_history(self):
         """Save profile access history to the history file."""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.history, f, indent=4)
+        _store_json(self.history_file, self.history, self.durable)
         logger.info(f"History saved to {self.history_file}")
 
+    @property
+    def history(self):
+        """
+        Profile access history in the history file format.
+
+        Returns:
+            dict: {profile_name: {"last_opened": str, "open_count": int}}, built on each access
+        """
+        return {profile_name: self._history_entry(profile_name) for profile_name in self._last_opened}
+
+    def _history_entry(self, profile_name):
+        """Return one profile's history entry in the history file format."""
+        return {"last_opened": self._last_opened[profile_name], "open_count": self._open_count[profile_name]}
+
+    def _replay_history_log(self):
+        """Apply the opens and removals recorded in the history log on top of the loaded history."""
+        try:
+            with open(self.history_log_file, 'rb') as f:
+                line = b""
+                for line in f:
+                    try:
+                        entry = _json_loads(line)
+                        profile_name = entry["profile"]
+                        if entry.get("removed"):
+                            self._open_count.pop(profile_name, None)
+                            self._last_opened.pop(profile_name, None)
+                            continue
+                        last_opened, open_count = entry["last_opened"], entry["open_count"]
+                        self._open_count[profile_name] = open_count
+                        self._last_opened[profile_name] = last_opened
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A torn final line from an interrupted write
+                        logger.warning(f"Ignoring invalid entry in {self.history_log_file}")
+                self._history_log_size = f.tell()
+                self._history_log_torn = bool(line) and not line.endswith(b"\n")
+        except FileNotFoundError:
+            pass
+
+    def _append_history(self, profile_name):
+        """Record a profile's current history entry in the history log."""
+        self._write_history_log({"profile": profile_name, **self._history_entry(profile_name)})
+
+    def _write_history_log(self, entry):
+        """Append one entry to the history log, opening the log on first use."""
+        if self._history_log is None:
+            self._history_log = open(self.history_log_file, 'ab', buffering=8192)
+            if self._history_log_torn:
+                # Keep the next entry off the torn line
+                self._history_log.write(b"\n")
+                self._history_log_torn = False
+        line = _json_dumps(entry, indent=False) + b"\n"
+        self._history_log.write(line)
+        self._history_log_size += len(line)
+        self._flush_requested.set()
+
+    def compact_history(self):
+        """Write the full history to the history file and empty the history log."""
+        with self._lock:
+            self._compact_history()
+
+    def _compact_history(self):
+        # The snapshot is written before the log is truncated; replaying a
+        # log over a snapshot that already contains it is harmless
+        self._save_history()
+        if self._history_log is not None:
+            self._history_log.close()
+            self._history_log = None
+        if self._history_log_size or os.path.exists(self.history_log_file):
+            open(self.history_log_file, 'w').close()
+        self._history_log_size = 0
+        self._history_log_torn = False
+
     def _load_batch_config(self):
         """Load batch configuration from JSON file."""
         try:
-            with open(self.batch_config_file, 'r') as f:
-                return json.load(f)
+            return _load_json_cached(self.batch_config_file)
         except FileNotFoundError:
             logger.warning(f"Batch config file not found: {self.batch_config_file}")
             return {}
@@ -115,8 +472,79 @@ class EdgeProfileManager:
 
     def save_batch_config(self):
         """Save batch configuration to JSON file."""
-        with open(self.batch_config_file, 'w') as f:
-            json.dump(self.batch_config, f, indent=4)
+        _store_json(self.batch_config_file, self.batch_config, self.durable)
+
+    def _mark_dirty(self, name):
+        """Record that a data set changed; it is written on the next flush(). Call with the lock held."""
+        self._dirty.add(name)
+        self._flush_requested.set()
+
+    def _flusher_loop(self):
+        """Background thread: flush shortly after changes, coalescing bursts into one write."""
+        while True:
+            self._flush_requested.wait()
+            if self._stop_flusher.wait(FLUSH_INTERVAL):
+                return
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"Background flush failed: {e}")
+
+    def close(self):
+        """
+        Stop the background flusher and write everything still pending.
+
+        Open browsers are left running; use close_all_profiles() for those.
+        After close(), changes are only written by explicit flush() calls.
+        """
+        if not self._stop_flusher.is_set():
+            self._stop_flusher.set()
+            self._flush_requested.set()
+            self._flusher.join()
+            atexit.unregister(self._close_at_exit)
+        self.flush()
+        with self._lock:
+            if self._history_log is not None:
+                self._history_log.close()
+                self._history_log = None
+
+    def _close_at_exit(self):
+        # No caller is left to report a failed save to at exit
+        try:
+            self.close()
+        except OSError as e:
+            logger.error(f"Could not save changes at exit: {e}")
+
+    def flush(self):
+        """
+        Write the profiles and batch configuration changed since the last flush.
+
+        History changes are already in the history log; its pending entries are
+        flushed, and the log is compacted into the history file once it grows
+        past HISTORY_LOG_COMPACT_BYTES. Called
+        automatically by a background thread about FLUSH_INTERVAL seconds after
+        each change, by close() and close_all_profiles(), and when the
+        interpreter exits.
+        """
+        with self._lock:
+            # Take the marks before writing; a save that fails puts its mark back
+            dirty, self._dirty = self._dirty, set()
+            try:
+                if "profiles" in dirty:
+                    self._save_profiles()
+                    dirty.discard("profiles")
+                if self._history_log_size > HISTORY_LOG_COMPACT_BYTES:
+                    self._compact_history()
+                elif self._history_log is not None:
+                    self._history_log.flush()
+                    if self.durable:
+                        os.fsync(self._history_log.fileno())
+                if "batch_config" in dirty:
+                    self.save_batch_config()
+                    dirty.discard("batch_config")
+            finally:
+                self._dirty |= dirty
 
     def get_batch_names(self):
         """Get list of available batch names."""
@@ -124,35 +552,48 @@ class EdgeProfileManager:
 
     def add_batch(self, batch_name, profiles, batch_size=5, profile_delay=2, batch_delay=30):
         """Add or update a batch configuration."""
-        self.batch_config[batch_name] = {
-            "profiles": profiles,
-            "batch_size": batch_size,
-            "profile_delay": profile_delay,
-            "batch_delay": batch_delay
-        }
-        self.save_batch_config()
+        with self._lock:
+            self.batch_config[batch_name] = {
+                "profiles": profiles,
+                "batch_size": batch_size,
+                "profile_delay": profile_delay,
+                "batch_delay": batch_delay
+            }
+            self._mark_dirty("batch_config")
 
     def remove_batch(self, batch_name):
         """Remove a batch configuration."""
-        if batch_name in self.batch_config:
+        with self._lock:
+            if batch_name not in self.batch_config:
+                return False
             del self.batch_config[batch_name]
-            self.save_batch_config()
-            return True
-        return False
+            self._mark_dirty("batch_config")
+        return True
 
-    def run_batch(self, batch_name):
-        """Run a specific batch configuration."""
+    def run_batch_iter(self, batch_name, concurrent=True):
+        """
+        Run a specific batch configuration, yielding each profile's result as it is processed.
+
+        The batch name is checked immediately; the returned iterator yields the
+        (status, profile_name, error) tuples of open_profiles_in_batches_iter().
+        The batch's profile delay only applies when concurrent is False.
+        """
         if batch_name not in self.batch_config:
             raise ValueError(f"Batch '{batch_name}' not found in configuration")
 
         config = self.batch_config[batch_name]
-        return self.open_profiles_in_batches(
+        return self.open_profiles_in_batches_iter(
             profile_names=config["profiles"],
             batch_size=config["batch_size"],
             delay_between_profiles=config["profile_delay"],
-            delay_between_batches=config["batch_delay"]
+            delay_between_batches=config["batch_delay"],
+            concurrent=concurrent
         )
 
+    def run_batch(self, batch_name, concurrent=True):
+        """Run a specific batch configuration."""
+        return self._collect_batch_results(self.run_batch_iter(batch_name, concurrent=concurrent))
+
     def add_profile(self, profile_name, profile_path=None, preferred_language=None):
         """
         Add a new Edge profile to the manager.
@@ -164,41 +605,38 @@ class EdgeProfileManager:
             preferred_language (str, optional): Preferred language for this profile
 
         Returns:
-            bool: True if profile was added successfully, False otherwise
+            dict: The stored profile information, or None if the profile already exists
         """
-        if profile_name in self.profiles:
-            logger.warning(f"Profile '{profile_name}' already exists")
-            return False
-
-        # If profile_path is not provided, use a standard naming convention
-        # Edge typically uses "Profile 1", "Profile 2", etc.
         if profile_path is None:
-            # Try to determine the next available profile number
-            existing_profiles = [p.get("path") for p in self.profiles.values()]
-            profile_numbers = []
-            for path in existing_profiles:
-                if path and path.startswith("Profile "):
-                    try:
-                        num = int(path.split(" ")[1])
-                        profile_numbers.append(num)
-                    except (ValueError, IndexError):
-                        pass
-
-            next_number = 1
-            if profile_numbers:
-                next_number = max(profile_numbers) + 1
-
-            profile_path = f"Profile {next_number}"
-            logger.info(f"Using auto-generated profile path: {profile_path}")
-
-        self.profiles[profile_name] = {
-            "path": profile_path,
-            "preferred_language": preferred_language,
-            "created_at": datetime.now().isoformat()
-        }
-        self._save_profiles()
+            # Also skip numbers whose directory already exists, so a new
+            # profile never picks up another Edge profile's data
+            on_disk = max((_profile_number(name) for name in self.discover_profiles()), default=0)
+
+        with self._lock:
+            if profile_name in self.profiles:
+                logger.warning(f"Profile '{profile_name}' already exists")
+                return None
+
+            # If profile_path is not provided, use a standard naming convention
+            # Edge typically uses "Profile 1", "Profile 2", etc.
+            if profile_path is None:
+                self._max_profile_num = max(self._max_profile_num, on_disk) + 1
+                profile_path = f"Profile {self._max_profile_num}"
+                logger.info(f"Using auto-generated profile path: {profile_path}")
+            else:
+                self._max_profile_num = max(self._max_profile_num, _profile_number(profile_path))
+
+            profile_info = {
+                "path": profile_path,
+                "preferred_language": preferred_language,
+                "created_at": datetime.now().isoformat()
+            }
+            self.profiles[profile_name] = profile_info
+            if profile_name not in self._last_opened:
+                self._unopened[profile_name] = None
+            self._mark_dirty("profiles")
         logger.info(f"Added new profile: {profile_name}")
-        return True
+        return profile_info
 
     def remove_profile(self, profile_name):
         """
@@ -210,17 +648,21 @@ class EdgeProfileManager:
         Returns:
             bool: True if profile was removed successfully, False otherwise
         """
-        if profile_name not in self.profiles:
-            logger.warning(f"Profile '{profile_name}' does not exist")
-            return False
+        with self._lock:
+            if profile_name not in self.profiles:
+                logger.warning(f"Profile '{profile_name}' does not exist")
+                return False
 
-        del self.profiles[profile_name]
-        self._save_profiles()
+            del self.profiles[profile_name]
+            self._unopened.pop(profile_name, None)
+            self._mark_dirty("profiles")
 
-        # Also remove from history if exists
-        if profile_name in self.history:
-            del self.history[profile_name]
-            self._save_history()
+            # Also remove from history if exists. A tombstone in the history log
+            # records this without rewriting the whole history file.
+            if profile_name in self._last_opened:
+                del self._last_opened[profile_name]
+                del self._open_count[profile_name]
+                self._write_history_log({"profile": profile_name, "removed": True})
 
         logger.info(f"Removed profile: {profile_name}")
         return True
@@ -241,7 +683,57 @@ class EdgeProfileManager:
         Returns:
             list: List of profile names that have not been opened
         """
-        return [name for name in self.profiles if name not in self.history]
+        return list(self._unopened)
+
+    def discover_profiles(self):
+        """
+        List the Edge profile directories present in the User Data directory.
+
+        A scan is reused for DISCOVERY_TTL seconds, and after that for as long
+        as the directory's modification time is unchanged.
+
+        Returns:
+            list: Directory names such as "Default" and "Profile 1"
+        """
+        now = time.monotonic()
+        cached = self._discovered
+        if cached is not None and now - cached[0] < DISCOVERY_TTL:
+            return list(cached[2])
+
+        try:
+            mtime = os.stat(self.user_data_dir).st_mtime_ns
+            if cached is not None and cached[1] == mtime:
+                names = cached[2]
+            else:
+                # scandir reports the entry type without a stat per directory
+                with os.scandir(self.user_data_dir) as entries:
+                    names = sorted(
+                        (entry.name for entry in entries
+                         if (entry.name == "Default" or entry.name.startswith("Profile ")) and entry.is_dir()),
+                        key=_profile_number
+                    )
+        except OSError as e:
+            logger.debug(f"Could not scan {self.user_data_dir}: {e}")
+            mtime, names = None, []
+
+        self._discovered = (now, mtime, names)
+        return list(names)
+
+    def auto_register_profiles(self):
+        """
+        Add every discovered Edge profile directory that is not registered yet.
+
+        New profiles are named after their directory, e.g. "Profile 3".
+
+        Returns:
+            list: Names of the profiles that were added
+        """
+        registered_paths = {profile_data.get("path") for profile_data in self.profiles.values()}
+        added = []
+        for directory in self.discover_profiles():
+            if directory not in registered_paths and self.add_profile(directory, directory) is not None:
+                added.append(directory)
+        return added
 
     def open_profile(self, profile_name):
         """
@@ -257,21 +749,15 @@ class EdgeProfileManager:
             logger.error(f"Profile '{profile_name}' does not exist")
             raise ValueError(f"Profile '{profile_name}' does not exist")
 
+        webdriver, Options, WebDriverException = _lazy_selenium()
         profile_data = self.profiles[profile_name]
-        profile_path = profile_data["profile_path"] if "profile_path" in profile_data else profile_data["path"]
-
-        # Get the Edge User Data directory
-        user_data_dir = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge\User Data")
+        profile_path = profile_data["path"]
 
-        # Set up Edge options
+        # Set up Edge options, starting from the arguments shared by every profile.
+        # A fresh Options object per call keeps concurrent launches independent.
         edge_options = Options()
-        edge_options.add_argument(f"--user-data-dir={user_data_dir}")
+        edge_options._arguments = list(self._base_options_args)
         edge_options.add_argument(f"--profile-directory={profile_path}")
-        
-        # Add these options to prevent crashes
-        edge_options.add_argument("--no-sandbox")
-        edge_options.add_argument("--disable-dev-shm-usage")
-        edge_options.add_argument("--remote-debugging-port=0")
         edge_options.add_experimental_option("excludeSwitches", ["enable-logging"])
 
         # Add language preference if specified
@@ -281,16 +767,17 @@ class EdgeProfileManager:
         try:
             # Launch Edge with the specified profile
             driver = webdriver.Edge(options=edge_options)
-            
-            # Store the driver instance
-            self.active_drivers[profile_name] = driver
-
-            # Update history
-            self.history[profile_name] = {
-                "last_opened": datetime.now().isoformat(),
-                "open_count": self.history.get(profile_name, {}).get("open_count", 0) + 1
-            }
-            self._save_history()
+            opened_at = datetime.now().isoformat()
+
+            with self._lock:
+                # Store the driver instance
+                self.active_drivers[profile_name] = driver
+
+                # Update history
+                self._open_count[profile_name] += 1
+                self._last_opened[profile_name] = opened_at
+                self._append_history(profile_name)
+                self._unopened.pop(profile_name, None)
 
             logger.info(f"Opened Edge with profile: {profile_name}")
             return driver
@@ -312,6 +799,7 @@ class EdgeProfileManager:
         """
         # Close the current profile if it's open
         if from_profile in self.active_drivers:
+            WebDriverException = _lazy_selenium()[2]
             try:
                 self.active_drivers[from_profile].quit()
                 del self.active_drivers[from_profile]
@@ -333,49 +821,109 @@ class EdgeProfileManager:
         Returns:
             bool: True if language preference was set successfully, False otherwise
         """
-        if profile_name not in self.profiles:
-            logger.error(f"Profile '{profile_name}' does not exist")
-            return False
+        with self._lock:
+            if profile_name not in self.profiles:
+                logger.error(f"Profile '{profile_name}' does not exist")
+                return False
 
-        self.profiles[profile_name]["preferred_language"] = language_code
-        self._save_profiles()
+            self.profiles[profile_name]["preferred_language"] = language_code
+            self._mark_dirty("profiles")
         logger.info(f"Set preferred language for '{profile_name}' to '{language_code}'")
         return True
 
-    def close_all_profiles(self):
+    def close_all_profiles(self, fast=False):
         """
         Close all open Edge browser instances.
 
+        Args:
+            fast (bool): If True, force-terminate every Edge and msedgedriver
+                         process on the machine (taskkill /F /T or pkill) instead
+                         of quitting each WebDriver session. This also kills your
+                         own browsing windows and other tools' WebDriver sessions,
+                         without giving Edge a chance to save its state.
+
         Returns:
             int: Number of browser instances closed
         """
-        count = 0
-        for profile_name, driver in list(self.active_drivers.items()):
-            try:
-                driver.quit()
-                del self.active_drivers[profile_name]
-                count += 1
-                logger.info(f"Closed profile: {profile_name}")
-            except WebDriverException as e:
-                logger.warning(f"Error closing profile '{profile_name}': {e}")
+        if fast:
+            count = self._kill_edge_processes()
+        else:
+            count = 0
+            drivers = list(self.active_drivers.items())
+            if drivers:
+                WebDriverException = _lazy_selenium()[2]
+                # quit() mostly waits on the driver process, so close them all at once
+                with ThreadPoolExecutor(max_workers=min(32, len(drivers))) as executor:
+                    futures = {executor.submit(driver.quit): profile_name for profile_name, driver in drivers}
+                    for future in as_completed(futures):
+                        profile_name = futures[future]
+                        try:
+                            future.result()
+                        except WebDriverException as e:
+                            logger.warning(f"Error closing profile '{profile_name}': {e}")
+                            continue
+                        with self._lock:
+                            self.active_drivers.pop(profile_name, None)
+                        count += 1
+                        logger.info(f"Closed profile: {profile_name}")
+
+        self.flush()
+        return count
 
+    def _kill_edge_processes(self):
+        """
+        Terminate all Edge and Edge WebDriver processes with the platform's kill command.
+
+        Falls back to quitting the tracked sessions one by one when the
+        platform's kill command is not available.
+
+        Returns:
+            int: Number of tracked browser instances that were terminated
+        """
+        if os.name == "nt":
+            commands = [["taskkill", "/F", "/T", "/IM", "msedge.exe", "/IM", "msedgedriver.exe"]]
+        elif sys.platform == "darwin":
+            # The browser process is "Microsoft Edge" on macOS; its helper
+            # processes exit with it
+            commands = [["pkill", "-x", "Microsoft Edge"], ["pkill", "-x", "msedgedriver"]]
+        else:
+            # Match the process name (msedge, msedgedriver); -f would also hit
+            # any command line that merely mentions msedge
+            commands = [["pkill", "^msedge"]]
+
+        executable = shutil.which(commands[0][0])
+        if executable is None:
+            logger.warning(f"'{commands[0][0]}' not found, closing profiles one by one")
+            return self.close_all_profiles()
+
+        for command in commands:
+            # Exits non-zero when no matching process is running, which is not an error here
+            subprocess.run([executable] + command[1:], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        with self._lock:
+            count = len(self.active_drivers)
+            self.active_drivers.clear()
+        logger.info("Terminated all Edge processes")
         return count
 
-    def open_multiple_profiles(self, profile_names, delay_between=2, skip_missing=True):
+    def open_multiple_profiles(self, profile_names, delay_between=2, skip_missing=True, concurrent=True, max_workers=5):
         """
         Open multiple Edge profiles simultaneously.
 
         Args:
             profile_names (list): List of profile names to open
-            delay_between (int): Delay in seconds between opening profiles
+            delay_between (int): Delay in seconds between opening profiles (sequential mode only)
             skip_missing (bool): If True, will skip profiles that don't exist instead of raising an error
+            concurrent (bool): If True, launch up to max_workers browsers at the same time;
+                               if False, open them one after another with delay_between
+            max_workers (int): Maximum number of browsers launched at once
 
         Returns:
             dict: Dictionary mapping profile names to their WebDriver instances
         """
-        drivers = {}
+        # Check every profile exists before opening any of them
+        to_open = []
         for profile_name in profile_names:
-            # Check if profile exists before trying to open it
             if profile_name not in self.profiles:
                 if skip_missing:
                     logger.warning(f"Skipping non-existent profile: '{profile_name}'")
@@ -383,7 +931,21 @@ class EdgeProfileManager:
                 else:
                     logger.error(f"Profile '{profile_name}' does not exist")
                     raise ValueError(f"Profile '{profile_name}' does not exist")
+            to_open.append(profile_name)
+
+        drivers = {}
+        if concurrent and to_open:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self.open_profile, name): name for name in to_open}
+                for future in as_completed(futures):
+                    profile_name = futures[future]
+                    try:
+                        drivers[profile_name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to open profile '{profile_name}': {e}")
+            return drivers
 
+        for profile_name in to_open:
             try:
                 drivers[profile_name] = self.open_profile(profile_name)
                 time.sleep(delay_between)  # Add delay to prevent resource issues
@@ -405,56 +967,76 @@ class EdgeProfileManager:
             dict: Profile access history
         """
         if profile_name:
-            return self.history.get(profile_name, {})
+            return self._history_entry(profile_name) if profile_name in self._last_opened else {}
         return self.history
 
-    def open_profiles_in_batches(self, profile_names, batch_size=5, delay_between_profiles=2, delay_between_batches=30, skip_missing=True):
+    def _iter_open_concurrent(self, profile_names, max_workers):
         """
-        Open multiple Edge profiles in batches to manage system resources better.
+        Open profiles on a thread pool, yielding (status, profile_name, error) as each finishes.
 
-        Args:
-            profile_names (list): List of profile names to open
-            batch_size (int): Number of profiles to open in each batch
-            delay_between_profiles (int): Delay in seconds between opening profiles within a batch
-            delay_between_batches (int): Delay in seconds between batches
-            skip_missing (bool): If True, will skip profiles that don't exist instead of raising an error
+        Browser launches spend most of their time waiting on process startup,
+        so they are submitted together instead of being opened one after another.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.open_profile, name): name for name in profile_names}
+            for future in as_completed(futures):
+                profile_name = futures[future]
+                try:
+                    future.result()
+                    logger.info(f"Successfully opened profile: {profile_name}")
+                    yield "ok", profile_name, None
+                except Exception as e:
+                    logger.error(f"Failed to open profile '{profile_name}': {e}")
+                    yield "fail", profile_name, str(e)
 
-        Returns:
-            dict: Dictionary containing successful and failed profile openings
+    def open_profiles_in_batches_iter(self, profile_names, batch_size=5, delay_between_profiles=2, delay_between_batches=30, skip_missing=True, concurrent=True):
         """
-        results = {
-            "successful": [],
-            "failed": [],
-            "skipped": []
-        }
+        Open multiple Edge profiles in batches, reporting each profile as it is processed.
+
+        Takes the same arguments as open_profiles_in_batches(), but yields one
+        (status, profile_name, error) tuple per profile instead of collecting
+        the results. status is "ok", "fail" or "skip"; error is the failure
+        message for "fail" and None otherwise.
+        """
+        counts = {"ok": 0, "fail": 0, "skip": 0}
+
+        # Check every profile exists before opening any of them, so only known
+        # profiles are split into batches
+        valid = [name for name in profile_names if name in self.profiles]
+        missing = [name for name in profile_names if name not in self.profiles]
+        if missing and not skip_missing:
+            logger.error(f"Profile '{missing[0]}' does not exist")
+            raise ValueError(f"Profile '{missing[0]}' does not exist")
+        for profile_name in missing:
+            logger.warning(f"Skipping non-existent profile: '{profile_name}'")
+            counts["skip"] += 1
+            yield "skip", profile_name, None
 
         # Split profiles into batches
-        batches = [profile_names[i:i + batch_size] for i in range(0, len(profile_names), batch_size)]
-        
-        logger.info(f"Processing {len(profile_names)} profiles in {len(batches)} batches of {batch_size}")
+        batches = [valid[i:i + batch_size] for i in range(0, len(valid), batch_size)]
+
+        logger.info(f"Processing {len(valid)} profiles in {len(batches)} batches of {batch_size}")
 
         for batch_num, batch in enumerate(batches, 1):
             logger.info(f"Processing batch {batch_num}/{len(batches)} - Profiles: {batch}")
-            
-            # Process each profile in the current batch
-            for profile_name in batch:
-                if profile_name not in self.profiles:
-                    if skip_missing:
-                        logger.warning(f"Skipping non-existent profile: '{profile_name}'")
-                        results["skipped"].append(profile_name)
-                        continue
-                    else:
-                        logger.error(f"Profile '{profile_name}' does not exist")
-                        raise ValueError(f"Profile '{profile_name}' does not exist")
 
-                try:
-                    self.open_profile(profile_name)
-                    results["successful"].append(profile_name)
-                    logger.info(f"Successfully opened profile: {profile_name}")
-                    time.sleep(delay_between_profiles)
-                except Exception as e:
-                    logger.error(f"Failed to open profile '{profile_name}': {e}")
-                    results["failed"].append({"profile": profile_name, "error": str(e)})
+            if concurrent:
+                for event in self._iter_open_concurrent(batch, max_workers=batch_size):
+                    counts[event[0]] += 1
+                    yield event
+            else:
+                # Process each profile in the current batch
+                for profile_name in batch:
+                    try:
+                        self.open_profile(profile_name)
+                        logger.info(f"Successfully opened profile: {profile_name}")
+                        counts["ok"] += 1
+                        yield "ok", profile_name, None
+                        time.sleep(delay_between_profiles)
+                    except Exception as e:
+                        logger.error(f"Failed to open profile '{profile_name}': {e}")
+                        counts["fail"] += 1
+                        yield "fail", profile_name, str(e)
 
             # If this isn't the last batch, wait before processing the next batch
             if batch_num < len(batches):
@@ -463,10 +1045,52 @@ class EdgeProfileManager:
 
         # Log summary
         logger.info("Batch processing completed:")
-        logger.info(f"- Successful: {len(results['successful'])}")
-        logger.info(f"- Failed: {len(results['failed'])}")
-        logger.info(f"- Skipped: {len(results['skipped'])}")
+        logger.info(f"- Successful: {counts['ok']}")
+        logger.info(f"- Failed: {counts['fail']}")
+        logger.info(f"- Skipped: {counts['skip']}")
+
+    def open_profiles_in_batches(self, profile_names, batch_size=5, delay_between_profiles=2, delay_between_batches=30, skip_missing=True, concurrent=True):
+        """
+        Open multiple Edge profiles in batches to manage system resources better.
+
+        Args:
+            profile_names (list): List of profile names to open
+            batch_size (int): Number of profiles to open in each batch
+            delay_between_profiles (int): Delay in seconds between opening profiles within a batch
+            delay_between_batches (int): Delay in seconds between batches
+            skip_missing (bool): If True, will skip profiles that don't exist instead of raising an error
+            concurrent (bool): If True, open the profiles of each batch at the same time
+                               (delay_between_profiles is not used); if False, open
+                               them one after another
 
+        Returns:
+            dict: Dictionary containing successful and failed profile openings
+        """
+        events = self.open_profiles_in_batches_iter(
+            profile_names,
+            batch_size=batch_size,
+            delay_between_profiles=delay_between_profiles,
+            delay_between_batches=delay_between_batches,
+            skip_missing=skip_missing,
+            concurrent=concurrent
+        )
+        return self._collect_batch_results(events)
+
+    @staticmethod
+    def _collect_batch_results(events):
+        """Gather (status, profile_name, error) events into the results dict."""
+        results = {
+            "successful": [],
+            "failed": [],
+            "skipped": []
+        }
+        for status, profile_name, error in events:
+            if status == "ok":
+                results["successful"].append(profile_name)
+            elif status == "fail":
+                results["failed"].append({"profile": profile_name, "error": error})
+            else:
+                results["skipped"].append(profile_name)
         return results
 
 
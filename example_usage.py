@@ -29,7 +29,8 @@ def main():
     # Open multiple profiles simultaneously
     print("\nOpening multiple profiles...")
     profiles_to_open = ["Work", "Personal"]
-    drivers = manager.open_multiple_profiles(profiles_to_open, delay_between=2)
+    # Launched concurrently; pass concurrent=False, delay_between=2 to open them one at a time
+    drivers = manager.open_multiple_profiles(profiles_to_open)
 
     # Wait for a moment to let the browsers open
     time.sleep(5)